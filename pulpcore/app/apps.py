@@ -2,6 +2,7 @@ from collections import defaultdict
 from importlib import import_module
 
 from django import apps
+from django.db.models.signals import post_migrate
 from django.utils.module_loading import module_has_submodule
 
 from pulpcore.exceptions.plugin import MissingPlugin
@@ -139,3 +140,9 @@ class PulpAppConfig(PulpPluginAppConfig):
     # with manage.py, etc. This cannot contain a dot and must not conflict with the name of a
     # package containing a Django app.
     label = 'core'
+
+    def ready(self):
+        super().ready()
+        # circular import avoidance
+        from pulpcore.app.openapigenerator import clear_schema_cache
+        post_migrate.connect(clear_schema_cache, sender=self)
@@ -1,5 +1,8 @@
+import copy
 import re
+import threading
 from collections import OrderedDict
+from functools import lru_cache
 
 import uritemplate
 from django.utils.html import strip_tags
@@ -7,9 +10,88 @@ from drf_yasg import openapi
 from drf_yasg.generators import OpenAPISchemaGenerator
 from drf_yasg.inspectors import SwaggerAutoSchema
 from drf_yasg.openapi import Parameter
-from drf_yasg.utils import filter_none, force_real_str
+from drf_yasg.utils import filter_none, force_real_str, get_serializer_ref_name
+from rest_framework import serializers
 
 from pulpcore.app.models import RepositoryVersion
+from pulpcore.app.settings import INSTALLED_PULP_PLUGINS
+
+# Path prefix of all the API endpoints, ignored when building operation keys
+_API_PREFIX = '/pulp/api/v3'
+
+# Splits a CamelCase model name into its words
+_CAMEL_CASE_RE = re.compile('[A-Z][^A-Z]*')
+
+# Query parameters added to every GET operation
+_FIELDS_PARAMETER = Parameter(
+    name="fields",
+    in_="query",
+    description="A list of fields to include in the response.",
+    required=False,
+    type="string",
+)
+_EXCLUDE_FIELDS_PARAMETER = Parameter(
+    name="exclude_fields",
+    in_="query",
+    description="A list of fields to exclude from the response.",
+    required=False,
+    type="string",
+)
+
+# Summaries of the standard operations, keyed on the operation name
+_SUMMARY_FORMATS = {
+    'read': 'Inspect {article} {resource}',
+    'list': 'List {resource_plural}',
+    'create': 'Create {article} {resource}',
+    'update': 'Update {article} {resource}',
+    'delete': 'Delete {article} {resource}',
+    'partial_update': 'Partially update {article} {resource}',
+}
+
+# Generated schemas, keyed on everything that can change the output of
+# PulpOpenAPISchemaGenerator.get_schema(), least recently used first
+_SCHEMA_CACHE = OrderedDict()
+_SCHEMA_CACHE_SIZE = 32
+_SCHEMA_CACHE_LOCK = threading.Lock()
+
+
+def clear_schema_cache(**kwargs):
+    """
+    Drop the cached API schemas and everything cached while generating them.
+
+    This is connected to the ``post_migrate`` signal, so it accepts and ignores any signal kwargs.
+    That signal is only sent in the process running ``migrate``, web workers that are already
+    running keep their caches until they are restarted.
+    """
+    with _SCHEMA_CACHE_LOCK:
+        _SCHEMA_CACHE.clear()
+    _get_resource_names.cache_clear()
+    PulpOpenAPISchemaGenerator.get_parameter_slug_from_model.cache_clear()
+    PulpOpenAPISchemaGenerator.get_parameter_name.cache_clear()
+
+
+def _get_plugin_names():
+    """
+    Returns the names accepted by the ``plugin`` filter of the API schema.
+    """
+    return {'pulpcore'} | {name.split('.')[0] for name in INSTALLED_PULP_PLUGINS}
+
+
+@lru_cache(maxsize=None)
+def _get_resource_names(model):
+    """
+    Returns the names used to describe the operations on a model.
+
+    Args:
+        model (django.db.models.Model): The model for which the names are needed
+
+    Returns:
+        tuple[str,str,str]: the verbose name, the plural verbose name and the indefinite article
+            to use with the verbose name
+    """
+    resource = model._meta.verbose_name
+    article = 'an' if resource[0].lower() in 'aeiou' else 'a'
+    return resource, model._meta.verbose_name_plural, article
 
 
 class Paths(openapi.SwaggerDict):
@@ -68,26 +150,23 @@ class PulpOpenAPISchemaGenerator(OpenAPISchemaGenerator):
         prefix = ''
         resources = {}
         resource_example = {}
+        tag_names = {tag["name"] for tag in self.tags}
         paths = OrderedDict()
         for path, (view_cls, methods) in sorted(endpoints.items()):
+            # all the views of a path are instances of view_cls, so filter them all at once
+            if plugin_filter and view_cls.__module__.split('.')[0] != plugin_filter:
+                continue
             operations = {}
             for method, view in methods:
-                if plugin_filter:
-                    if view.__module__.split('.')[0] != plugin_filter:
-                        continue
                 if not public and not self._gen.has_view_permissions(path, method, view):
                     continue
                 operation = self.get_operation(view, path, prefix, method, components, request)
                 if operation is not None:
                     operations[method.lower()] = operation
                     tag = operation.tags[0]
-                    tag_dict = {"name": tag, "x-displayName": tag.title()}
-                    tag_exists = False
-                    for tag in self.tags:
-                        if tag["name"] == tag_dict["name"]:
-                            tag_exists = True
-                    if not tag_exists:
-                        self.tags.append(tag_dict)
+                    if tag not in tag_names:
+                        tag_names.add(tag)
+                        self.tags.append({"name": tag, "x-displayName": tag.title()})
 
             if operations:
                 path_param = None
@@ -97,18 +176,10 @@ class PulpOpenAPISchemaGenerator(OpenAPISchemaGenerator):
                     resource_other_path = self.get_resource_from_path(path)
                     if resource_other_path in endpoints:
                         view = endpoints[resource_other_path][0]
-                        if not hasattr(view, 'queryset') or view.queryset is None:
-                            if hasattr(view, 'model'):
-                                resource_model = view.model
-                            else:
-                                continue
-                        else:
-                            resource_model = view.queryset.model
-                        resource_name = self.get_parameter_name(resource_model)
-                        prefix_ = None
-                        if issubclass(resource_model, RepositoryVersion):
-                            prefix_ = view_cls.parent_viewset.endpoint_name
-                        param_name = self.get_parameter_slug_from_model(resource_model, prefix_)
+                        names = self.get_resource_parameter_names(view, view_cls)
+                        if names is None:
+                            continue
+                        resource_name, param_name = names
                         if resource_path in resources:
                             path = path.replace(resource_path, '{%s}' % resources[resource_path])
                         elif resource_other_path in resources:
@@ -153,6 +224,31 @@ class PulpOpenAPISchemaGenerator(OpenAPISchemaGenerator):
             resource_path = '%s{pulp_id}/' % resource_path.rsplit(sep='{', maxsplit=1)[0]
         return resource_path
 
+    @classmethod
+    def get_resource_parameter_names(cls, resource_view, view_cls):
+        """Returns the names used to document the path parameter of a nested resource
+
+        Args:
+            resource_view (rest_framework.views.APIView): view class of the nested resource
+            view_cls (rest_framework.views.APIView): view class bound to the documented path
+
+        Returns:
+            tuple[str,str]: the human readable name of the resource and the name of its path
+                parameter, or None if the resource view has neither a queryset nor a model
+        """
+        if not hasattr(resource_view, 'queryset') or resource_view.queryset is None:
+            if not hasattr(resource_view, 'model'):
+                return None
+            resource_model = resource_view.model
+        else:
+            resource_model = resource_view.queryset.model
+        resource_name = cls.get_parameter_name(resource_model)
+        prefix = None
+        if issubclass(resource_model, RepositoryVersion):
+            prefix = view_cls.parent_viewset.endpoint_name
+        param_name = cls.get_parameter_slug_from_model(resource_model, prefix)
+        return resource_name, param_name
+
     @staticmethod
     def get_resource_description(name, example_uri):
         """Returns a description of an *pulp_href path parameter
@@ -177,12 +273,11 @@ class PulpOpenAPISchemaGenerator(OpenAPISchemaGenerator):
         Returns:
             str: The path with concrete path parameters.
         """
-        params = {}
-        for variable in uritemplate.variables(path):
-            params[variable] = '1'
-        return uritemplate.expand(path, **params)
+        template = uritemplate.URITemplate(path)
+        return template.expand({variable: '1' for variable in template.variable_names})
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_parameter_slug_from_model(model, prefix):
         """Returns a path parameter name for the resource associated with the model.
 
@@ -193,14 +288,14 @@ class PulpOpenAPISchemaGenerator(OpenAPISchemaGenerator):
         Returns:
             str: *pulp_href where * is the model name in all lower case letters
         """
-        slug = '%s_href' % '_'.join([part.lower() for part in re.findall('[A-Z][^A-Z]*',
-                                                                         model.__name__)])
+        slug = '%s_href' % '_'.join(_CAMEL_CASE_RE.findall(model.__name__)).lower()
         if prefix:
             return '{}_{}'.format(prefix, slug)
         else:
             return slug
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_parameter_name(model):
         """Returns the human readable name of the resource associated with the model
 
@@ -210,7 +305,7 @@ class PulpOpenAPISchemaGenerator(OpenAPISchemaGenerator):
         Returns:
             str: name of the resource associated with the model
         """
-        return ' '.join(re.findall('[A-Z][^A-Z]*', model.__name__))
+        return ' '.join(_CAMEL_CASE_RE.findall(model.__name__))
 
     def get_operation_keys(self, subpath, method, view):
         """Return a list of keys that should be used to group an operation within the specification. ::
@@ -232,7 +327,8 @@ class PulpOpenAPISchemaGenerator(OpenAPISchemaGenerator):
         Returns:
             List of strings
         """
-        subpath = subpath.replace('/pulp/api/v3', '')
+        if subpath.startswith(_API_PREFIX):
+            subpath = subpath[len(_API_PREFIX):]
         return super().get_operation_keys(subpath, method, view)
 
     def get_schema(self, request=None, public=False):
@@ -241,6 +337,9 @@ class PulpOpenAPISchemaGenerator(OpenAPISchemaGenerator):
         This method also adds tags to the schema definition. This allows ReDoc to provide a display
         name for each section of the docs.
 
+        The generated schema is cached per combination of request options, so only the first
+        request for a given combination pays the cost of walking all the endpoints.
+
         Args:
             request (rest_framework.request.Request): the request used for filtering accessible
                 endpoints and finding the spec URI. Can be None.
@@ -250,10 +349,65 @@ class PulpOpenAPISchemaGenerator(OpenAPISchemaGenerator):
         Returns:
             openapi.Swagger: The generated Swagger specification
         """
+        key = self.get_schema_cache_key(request, public)
+        if key is not None:
+            with _SCHEMA_CACHE_LOCK:
+                cached = _SCHEMA_CACHE.get(key)
+                if cached is not None:
+                    _SCHEMA_CACHE.move_to_end(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
         schema = super().get_schema(request=request, public=public)
         schema.tags = self.tags
+        if key is not None:
+            cached = copy.deepcopy(schema)
+            with _SCHEMA_CACHE_LOCK:
+                _SCHEMA_CACHE[key] = cached
+                while len(_SCHEMA_CACHE) > _SCHEMA_CACHE_SIZE:
+                    _SCHEMA_CACHE.popitem(last=False)
         return schema
 
+    def get_schema_cache_key(self, request, public):
+        """Returns the key of the schema generated for a request in the schema cache.
+
+        Args:
+            request (rest_framework.request.Request): the request used for filtering accessible
+                endpoints and finding the spec URI. Can be None.
+            public (bool): if True, all endpoints are included regardless of access through
+                `request`
+
+        Returns:
+            tuple: the cache key, or None if the schema for this request should not be cached
+        """
+        if request is None:
+            return None
+
+        if self._gen.patterns is not None or self._gen.urlconf is not None:
+            # only the default urlconf is cached, generators for other endpoints always run
+            return None
+
+        plugin = request.query_params.get('plugin') or None
+        if plugin is not None and plugin not in _get_plugin_names():
+            # don't let arbitrary values of the filter grow the cache
+            return None
+
+        # public schemas don't depend on the permissions of the user
+        user = None if public else getattr(request.user, 'pk', None)
+        return (
+            self.info.title,
+            self.info.get('description'),
+            # the version drf_yasg puts in the schema
+            self.version or self.info._default_version,
+            public,
+            self.url,
+            request.build_absolute_uri('/'),
+            plugin,
+            'bindings' in request.query_params,
+            'include_html' in request.query_params,
+            user,
+        )
+
 
 class PulpAutoSchema(SwaggerAutoSchema):
     """
@@ -265,34 +419,16 @@ class PulpAutoSchema(SwaggerAutoSchema):
         consumes = self.get_consumes()
         produces = self.get_produces()
 
-        multipart = ['multipart/form-data', 'application/x-www-form-urlencoded']
-        if self.method != 'GET':
-            request_params = self.get_request_body_parameters(multipart)
-            type_list = [param['type'] for param in request_params if param]
-            if 'file' in type_list:
-                # automatically set the media type to form data if there's a file
-                # needed due to https://github.com/axnsan12/drf-yasg/issues/386
-                consumes = multipart
+        if self.method != 'GET' and self.has_file_field():
+            # automatically set the media type to form data if there's a file
+            # needed due to https://github.com/axnsan12/drf-yasg/issues/386
+            consumes = ['multipart/form-data', 'application/x-www-form-urlencoded']
 
         body = self.get_request_body_parameters(consumes)
         query = self.get_query_parameters()
         if self.method == 'GET':
-            fields_paramenter = Parameter(
-                name="fields",
-                in_="query",
-                description="A list of fields to include in the response.",
-                required=False,
-                type="string",
-            )
-            query.append(fields_paramenter)
-            not_fields_paramenter = Parameter(
-                name="exclude_fields",
-                in_="query",
-                description="A list of fields to exclude from the response.",
-                required=False,
-                type="string",
-            )
-            query.append(not_fields_paramenter)
+            query.append(_FIELDS_PARAMETER)
+            query.append(_EXCLUDE_FIELDS_PARAMETER)
         parameters = body + query
         parameters = filter_none(parameters)
         parameters = self.add_manual_parameters(parameters)
@@ -329,6 +465,17 @@ class PulpAutoSchema(SwaggerAutoSchema):
             deprecated=deprecated
         )
 
+    def has_file_field(self):
+        """
+        Returns True if the request serializer of the operation accepts a file.
+
+        Like the form parameters drf_yasg generates for the request, read only fields are ignored.
+        """
+        serializer = self.get_request_serializer()
+        fields = getattr(serializer, 'fields', None) or {}
+        return any(isinstance(field, serializers.FileField) and not field.read_only
+                   for field in fields.values())
+
     def get_summary(self, operation_keys):
         """
         Returns summary of operation.
@@ -338,25 +485,11 @@ class PulpAutoSchema(SwaggerAutoSchema):
         """
         if not hasattr(self.view, 'queryset') or self.view.queryset is None:
             return self.get_summary_and_description()[0]
-        model = self.view.queryset.model
-        operation = operation_keys[-1]
-        resource = model._meta.verbose_name
-        article = 'a'
-        if resource[0].lower() in 'aeiou':
-            article = 'an'
-        if operation == 'read':
-            return f'Inspect {article} {resource}'
-        elif operation == 'list':
-            resource = model._meta.verbose_name_plural
-            return f'List {resource}'
-        elif operation == 'create':
-            return f'Create {article} {resource}'
-        elif operation == 'update':
-            return f'Update {article} {resource}'
-        elif operation == 'delete':
-            return f'Delete {article} {resource}'
-        elif operation == 'partial_update':
-            return f'Partially update {article} {resource}'
+        summary = _SUMMARY_FORMATS.get(operation_keys[-1])
+        if summary is None:
+            return None
+        resource, resource_plural, article = _get_resource_names(self.view.queryset.model)
+        return summary.format(article=article, resource=resource, resource_plural=resource_plural)
 
     def get_tags(self, operation_keys):
         """Get a list of tags for this operation.
@@ -375,21 +508,43 @@ class PulpAutoSchema(SwaggerAutoSchema):
         """
         tags = self.overrides.get('tags')
         if not tags:
-            if len(operation_keys) > 2:
-                if len(operation_keys) > 3:
-                    del operation_keys[-3]
-                operation_keys[0] = "{key}:".format(key=operation_keys[0])
-            tags = [' '.join(operation_keys[:-1])]
+            keys = operation_keys[:-1]
+            if len(keys) > 2:
+                keys = keys[:-2] + keys[-1:]
+            if len(keys) > 1:
+                tags = ['{key}: {rest}'.format(key=keys[0], rest=' '.join(keys[1:]))]
+            else:
+                tags = [' '.join(keys)]
 
         return tags
 
+    def get_view_serializer(self):
+        """
+        Return the serializer as defined by the view's ``get_serializer()`` method.
+
+        Instantiating a model serializer builds all of its fields, so the serializer is created
+        once per operation and shared by the request body and the response schemas.
+        """
+        if not hasattr(self, '_view_serializer'):
+            self._view_serializer = super().get_view_serializer()
+        return self._view_serializer
+
+    def is_registered(self, serializer):
+        """
+        Returns True if the schema of the serializer is already registered as a definition.
+
+        A registered schema is referenced as is, without looking at the serializer's fields again.
+        """
+        ref_name = get_serializer_ref_name(serializer)
+        return bool(ref_name) and self.components.has(ref_name, scope=openapi.SCHEMA_DEFINITIONS)
+
     def serializer_to_schema(self, serializer):
         """
         Convert a serializer to an OpenAPI Schema.
         Patch: https://github.com/axnsan12/drf-yasg/issues/70#issuecomment-485050813
         """
 
-        if self.method.lower() == "get":
+        if self.method == 'GET' and not self.is_registered(serializer):
             new_fields = OrderedDict()
             for field_name, field in serializer.fields.items():
                 if not field.write_only:  # Removing write_only fields
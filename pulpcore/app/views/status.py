@@ -1,11 +1,12 @@
 import logging
 import shutil
+from functools import lru_cache
 from gettext import gettext as _
 
 from django.conf import settings
 from django.core.files.storage import default_storage
 from drf_yasg.utils import swagger_auto_schema
-from pkg_resources import get_distribution
+from pkg_resources import get_distribution, safe_name, working_set
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
@@ -28,6 +29,21 @@ def _disk_usage():
     return None
 
 
+@lru_cache(maxsize=None)
+def _installed_versions():
+    # Installed versions can't change without restarting the process, so enumerate the
+    # installed distributions once instead of resolving every component separately.
+    return {dist.key: dist.version for dist in working_set}
+
+
+def _get_version(component):
+    version = _installed_versions().get(safe_name(component).lower())
+    if version is None:
+        # let pkg_resources do the full lookup, and raise if the component isn't installed
+        version = get_distribution(component).version
+    return version
+
+
 class StatusView(APIView):
     """
     Returns status information about the application
@@ -48,7 +64,7 @@ class StatusView(APIView):
         components = ['pulpcore'] + INSTALLED_PULP_PLUGINS
         versions = [{
             'component': component,
-            'version': get_distribution(component).version
+            'version': _get_version(component)
         } for component in components]
         redis_status = {'connected': self._get_redis_conn_status()}
         db_status = {'connected': self._get_db_conn_status()}
@@ -0,0 +1,168 @@
+from types import SimpleNamespace
+from unittest import TestCase, mock
+
+from drf_yasg import openapi
+from drf_yasg.generators import OpenAPISchemaGenerator
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from pulpcore.app import openapigenerator
+from pulpcore.app.openapigenerator import PulpAutoSchema, PulpOpenAPISchemaGenerator
+
+
+def generate_schema(**kwargs):
+    return SimpleNamespace()
+
+
+@mock.patch.object(OpenAPISchemaGenerator, 'get_schema', side_effect=generate_schema)
+class TestSchemaCache(TestCase):
+    def setUp(self):
+        openapigenerator.clear_schema_cache()
+        self.addCleanup(openapigenerator.clear_schema_cache)
+
+    def get_schema(self, info=None, version='', patterns=None, **params):
+        request = Request(APIRequestFactory().get('/pulp/api/v3/docs/api.json', params))
+        info = info or openapi.Info(title='Pulp', default_version='v3')
+        generator = PulpOpenAPISchemaGenerator(info, version=version, patterns=patterns)
+        return generator.get_schema(request=request, public=True)
+
+    def test_hit_and_miss(self, mock_get_schema):
+        """
+        The schema is only generated once for the same request options.
+        """
+        first = self.get_schema()
+        second = self.get_schema()
+
+        self.assertEqual(mock_get_schema.call_count, 1)
+        self.assertEqual(len(openapigenerator._SCHEMA_CACHE), 1)
+        # neither the caller of a miss nor the caller of a hit gets the cached object
+        self.assertIsNot(first, second)
+        for cached in openapigenerator._SCHEMA_CACHE.values():
+            self.assertIsNot(cached, first)
+            self.assertIsNot(cached, second)
+
+    def test_request_options(self, mock_get_schema):
+        """
+        Each combination of plugin, bindings and include_html gets its own entry.
+        """
+        self.get_schema()
+        self.get_schema(plugin='pulpcore')
+        self.get_schema(bindings=1)
+        self.get_schema(include_html=1)
+        self.get_schema(bindings=1, include_html=1)
+
+        self.assertEqual(mock_get_schema.call_count, 5)
+        self.assertEqual(len(openapigenerator._SCHEMA_CACHE), 5)
+
+    def test_generator_options(self, mock_get_schema):
+        """
+        Generators with a different API info or version don't share schemas.
+        """
+        self.get_schema(info=openapi.Info(title='A', default_version='v3'))
+        self.get_schema(info=openapi.Info(title='B', default_version='v3'))
+        self.get_schema(info=openapi.Info(title='B', default_version='v4'))
+        self.get_schema(info=openapi.Info(title='B', default_version='v3'), version='v5')
+        self.get_schema(info=openapi.Info(title='A', default_version='v3'))
+
+        self.assertEqual(mock_get_schema.call_count, 4)
+        self.assertEqual(len(openapigenerator._SCHEMA_CACHE), 4)
+
+    def test_custom_patterns(self, mock_get_schema):
+        """
+        Schemas of generators restricted to some url patterns are not cached.
+        """
+        self.get_schema(patterns=[])
+        self.get_schema(patterns=[])
+
+        self.assertEqual(mock_get_schema.call_count, 2)
+        self.assertEqual(len(openapigenerator._SCHEMA_CACHE), 0)
+
+    def test_unknown_plugin(self, mock_get_schema):
+        """
+        Schemas filtered on a plugin that isn't installed are not cached.
+        """
+        self.get_schema(plugin='not_a_plugin')
+        self.get_schema(plugin='not_a_plugin')
+
+        self.assertEqual(mock_get_schema.call_count, 2)
+        self.assertEqual(len(openapigenerator._SCHEMA_CACHE), 0)
+
+    def test_size_limit(self, mock_get_schema):
+        """
+        The least recently used schema is dropped once the cache is full.
+        """
+        with mock.patch.object(openapigenerator, '_SCHEMA_CACHE_SIZE', 2):
+            self.get_schema()
+            self.get_schema(bindings=1)
+            self.get_schema()
+            self.get_schema(include_html=1)
+            self.get_schema()
+            self.get_schema(bindings=1)
+
+        self.assertEqual(mock_get_schema.call_count, 4)
+        self.assertEqual(len(openapigenerator._SCHEMA_CACHE), 2)
+
+    def test_clear(self, mock_get_schema):
+        """
+        clear_schema_cache() empties the cache.
+        """
+        self.get_schema()
+        openapigenerator.clear_schema_cache()
+        self.assertEqual(len(openapigenerator._SCHEMA_CACHE), 0)
+
+        self.get_schema()
+        self.assertEqual(mock_get_schema.call_count, 2)
+
+
+class TestPulpAutoSchema(TestCase):
+    def get_auto_schema(self, view=None, overrides=None):
+        return PulpAutoSchema(view or mock.Mock(), '/', 'GET', None, None, overrides or {})
+
+    def test_get_tags(self):
+        """
+        Tags are built from all but the last operation key, without the next to last resource.
+        """
+        cases = [
+            (['artifacts', 'list'], 'artifacts'),
+            (['content', 'file', 'list'], 'content: file'),
+            (['repositories', 'file', 'versions', 'list'], 'repositories: versions'),
+            (['repositories', 'file', 'file', 'versions', 'list'], 'repositories: file versions'),
+        ]
+        auto_schema = self.get_auto_schema()
+        for operation_keys, tag in cases:
+            with self.subTest(operation_keys=operation_keys):
+                self.assertEqual(auto_schema.get_tags(list(operation_keys)), [tag])
+
+    def test_get_tags_override(self):
+        """
+        Tags set through swagger_auto_schema are used as is.
+        """
+        auto_schema = self.get_auto_schema(overrides={'tags': ['custom']})
+        self.assertEqual(auto_schema.get_tags(['artifacts', 'list']), ['custom'])
+
+    def test_get_summary(self):
+        """
+        Summaries are built from the model's verbose names.
+        """
+        artifact = type('Artifact', (), {
+            '_meta': SimpleNamespace(verbose_name='artifact', verbose_name_plural='artifacts')
+        })
+        repository = type('Repository', (), {
+            '_meta': SimpleNamespace(verbose_name='repository',
+                                     verbose_name_plural='repositories')
+        })
+        cases = [
+            (artifact, 'read', 'Inspect an artifact'),
+            (artifact, 'list', 'List artifacts'),
+            (artifact, 'create', 'Create an artifact'),
+            (repository, 'update', 'Update a repository'),
+            (repository, 'delete', 'Delete a repository'),
+            (repository, 'partial_update', 'Partially update a repository'),
+            (repository, 'list', 'List repositories'),
+            (repository, 'sync', None),
+        ]
+        for model, operation, summary in cases:
+            with self.subTest(model=model, operation=operation):
+                view = mock.Mock(queryset=mock.Mock(model=model))
+                auto_schema = self.get_auto_schema(view=view)
+                self.assertEqual(auto_schema.get_summary(['things', operation]), summary)